@@ -1,35 +1,122 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
-import speech_recognition as sr
-import pyttsx3
 import re
-import random
+import csv
+import queue
+import threading
+import itertools
 import os
-from datetime import datetime
+import errno
+import time
+from enum import IntEnum
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 from warnings import warn
 
+_VOICE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:rs|rupees|₹)?\s*", re.IGNORECASE)
+_NS_PER_DAY = 86_400_000_000_000
+
+def _local_now_ns():
+    now_us = time.time_ns() // 1000 + time.localtime().tm_gmtoff * 1_000_000
+    return now_us * 1000
+
+def _ols1d(x, y):
+    x_mean, y_mean = x.mean(), y.mean()
+    dx = x - x_mean
+    denom = np.dot(dx, dx)
+    slope = np.dot(dx, y - y_mean) / denom if denom else 0.0
+    return slope, y_mean - slope * x_mean
+
+def _argmax_hist(codes, n_cats):
+    return np.bincount(codes[codes >= 0], minlength=n_cats).argmax()
+
 class VoiceAssistant:
-    def __init__(self):
+    def __init__(self, stt_model="tiny.en"):
+        import speech_recognition as sr
         self.recognizer = sr.Recognizer()
         self.mic = sr.Microphone()
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 150)
+        self.stt_model = stt_model
+        self._whisper = None
+        self._whisper_error = None
+        self._whisper_loader = None
+        self._queue = queue.Queue()
+        threading.Thread(target=self._worker, daemon=True).start()
+
+    def _load_whisper(self):
+        try:
+            from faster_whisper import WhisperModel
+            self._whisper = WhisperModel(self.stt_model, compute_type="int8")
+        except Exception as e:
+            self._whisper = None
+            self._whisper_error = e
+
+    def _worker(self):
+        try:
+            import pyttsx3
+            self.engine = pyttsx3.init()
+            self.engine.setProperty('rate', 150)
+        except Exception as e:
+            print(f"⚠️ Speech unavailable: {str(e)}")
+            self.engine = None
+        while True:
+            text = self._queue.get()
+            try:
+                if self.engine is not None:
+                    self.engine.say(text)
+                    self.engine.runAndWait()
+            except Exception as e:
+                print(f"⚠️ Speech error: {str(e)}")
+            finally:
+                self._queue.task_done()
         
     def listen(self):
+        self.wait()
+        if self._whisper_loader is None:
+            self._whisper_loader = threading.Thread(target=self._load_whisper, daemon=True)
+            self._whisper_loader.start()
         with self.mic as source:
             print("\n🎤 Speak now (e.g., '500 rupees for pizza')...")
             audio = self.recognizer.listen(source, phrase_time_limit=5)
         try:
-            return self.recognizer.recognize_google(audio).lower()
+            self._whisper_loader.join()
+            if self._whisper is not None:
+                text = self._transcribe(audio)
+            else:
+                if self._whisper_error is not None:
+                    print(f"⚠️ Local speech model unavailable ({str(self._whisper_error)}); "
+                          "sending audio to Google speech recognition")
+                    self._whisper_error = None
+                text = self.recognizer.recognize_google(audio)
+            return re.sub(r"[,!?]|\.(?!\d)", "", text).strip().lower() or None
         except:
             return None
+
+    def _transcribe(self, audio):
+        pcm = np.frombuffer(
+            audio.get_raw_data(convert_rate=16000, convert_width=2), np.int16
+        ).astype(np.float32) / 32768
+        segments, _ = self._whisper.transcribe(pcm, beam_size=1, language="en")
+        return " ".join(segment.text.strip() for segment in segments)
             
     def speak(self, text):
         print(f"🔊 AI: {text}")
-        self.engine.say(text)
-        self.engine.runAndWait()
+        self._queue.put(text)
+
+    def wait(self):
+        self._queue.join()
+
+class Cat(IntEnum):
+    FOOD = 0
+    TRANSPORT = 1
+    RENT = 2
+    OTHERS = 3
+
+    @property
+    def label(self):
+        return self.name.title()
 
 class ExpenseClassifier:
     def __init__(self):
@@ -38,20 +125,58 @@ class ExpenseClassifier:
             "Transport": r"(uber|ola|taxi|bus|train|metro|petrol|fuel)",
             "Rent": r"(rent|room|pg|hostel|deposit|lease)"
         }
+        self.categories = [cat.label for cat in Cat]
+        self._group_ids = {category: Cat[category.upper()] for category in self.patterns}
+        self._re = re.compile(
+            "|".join(f"(?P<{category}>{pattern.strip('()')})"
+                     for category, pattern in self.patterns.items()),
+            re.IGNORECASE
+        )
+        self._automaton = self._build_automaton() if ahocorasick else None
+
+    def _build_automaton(self):
+        automaton = ahocorasick.Automaton()
+        for category, pattern in self.patterns.items():
+            for keyword in pattern.strip("()").split("|"):
+                if not automaton.exists(keyword):
+                    automaton.add_word(keyword, self._group_ids[category])
+        automaton.make_automaton()
+        return automaton
         
     def classify(self, text):
-        text = text.lower()
-        for category, pattern in self.patterns.items():
-            if re.search(pattern, text):
-                return category
-        return "Others"
+        if self._automaton is not None:
+            for _, category_id in self._automaton.iter(text.lower()):
+                return category_id
+            return Cat.OTHERS
+        match = self._re.search(text)
+        return self._group_ids[match.lastgroup] if match else Cat.OTHERS
+
+    def classify_many(self, descriptions):
+        matches = descriptions.astype(str).str.extract(self._re).notna()
+        ids = matches.idxmax(axis=1).map(self._group_ids)
+        return ids.where(matches.any(axis=1), Cat.OTHERS).astype(np.int8)
 
 class BudgetAI:
     def __init__(self, data_file="expenses.csv"):
         self.file = data_file
-        self.voice = VoiceAssistant()
+        self._voice = None
         self.classifier = ExpenseClassifier()
-        self.df = self._load_data()
+        self.columns = ["Amount", "Category", "Date"]
+        self.categories = list(self.classifier.categories)
+        self.category_dtype = pd.CategoricalDtype(self.categories)
+        self._amt = np.empty(64, np.float32)
+        self._cat = np.empty(64, np.int8)
+        self._dt = np.empty(64, np.int64)
+        self._month = np.empty(64, np.int32)
+        self._n = 0
+        self._df_version = 0
+        self._df_cache = (None, None)
+        self._analysis_cache = (None, None)
+        self._top_category_cache = (None, None)
+        self.compact_every = 256
+        history = self._load_data()
+        history['Category'] = self._category_codes(history['Category'])
+        self._extend(history)
         
         self.tips_db = {
             "Food": [
@@ -67,40 +192,279 @@ class BudgetAI:
                 "💡 Switch to LED bulbs to reduce electricity bills!"
             ]
         }
+        self._default_cycler = itertools.cycle([
+            "💰 Save 10% of every paycheck automatically!"
+        ])
+        self._tip_cyclers = [
+            itertools.cycle(self.tips_db[cat.label]) if cat.label in self.tips_db
+            else self._default_cycler
+            for cat in Cat
+        ]
         
+    @property
+    def voice(self):
+        if self._voice is None:
+            self._voice = VoiceAssistant()
+        return self._voice
+
+    @property
+    def df(self):
+        version, df = self._df_cache
+        if version != self._df_version:
+            n = self._n
+            df = pd.DataFrame({
+                "Amount": self._amt[:n],
+                "Category": pd.Categorical.from_codes(
+                    self._cat[:n], dtype=self.category_dtype),
+                "Date": self._dt[:n].view('datetime64[ns]')
+            }, copy=False)
+            self._df_cache = (self._df_version, df)
+        return df
+
+    def _reserve(self, n_rows):
+        capacity = len(self._amt)
+        if n_rows <= capacity:
+            return
+        while capacity < n_rows:
+            capacity *= 2
+        self._amt = np.resize(self._amt, capacity)
+        self._cat = np.resize(self._cat, capacity)
+        self._dt = np.resize(self._dt, capacity)
+        self._month = np.resize(self._month, capacity)
+
+    def _category_code(self, category):
+        if category not in self.categories:
+            self.categories.append(category)
+            self.category_dtype = pd.CategoricalDtype(self.categories)
+        return self.categories.index(category)
+
+    def _category_codes(self, labels):
+        for category in labels.dropna().astype(str).unique():
+            self._category_code(category)
+        return self.category_dtype.categories.get_indexer(labels)
+
+    def _extend(self, df):
+        n = len(df)
+        if not n:
+            return
+        start, end = self._n, self._n + n
+        self._reserve(end)
+        self._amt[start:end] = df['Amount'].to_numpy(np.float32)
+        self._cat[start:end] = df['Category'].to_numpy(np.int8)
+        dates = df['Date'].to_numpy('datetime64[ns]')
+        self._dt[start:end] = dates.view(np.int64)
+        self._month[start:end] = dates.astype('datetime64[M]').astype(np.int32)
+        self._n = end
+        self._df_version += 1
+
+    def _is_parquet(self):
+        return self.file.endswith(".parquet")
+
+    def _read_csv(self, path):
+        df = pd.read_csv(
+            path, 
+            dtype={'Amount': 'float32', 'Category': 'category'},
+            memory_map=True
+        )
+        df['Date'] = pd.to_datetime(df['Date'], format='ISO8601')
+        self.columns = list(df.columns)
+        return df
+
     def _load_data(self):
         try:
-            df = pd.read_csv(
-                self.file, 
-                parse_dates=['Date'],
-                dtype={'Amount': 'float32', 'Category': 'category'}
-            )
-            df['Date'] = pd.to_datetime(df['Date'])
-            return df
+            if not self._is_parquet():
+                return self._read_csv(self.file)
+            legacy_csv = os.path.splitext(self.file)[0] + ".csv"
+            if not os.path.exists(self.file) and os.path.exists(legacy_csv):
+                df = self._read_csv(legacy_csv)
+                self._write_parquet(df)
+                print(f"📦 Migrated {legacy_csv} to {self.file}")
+                return df
+            if not os.path.exists(self.file):
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), self.file)
+            if os.path.isfile(self.file):
+                return self._migrate_parquet_file()
+            return self._read_parquet_dataset()
         except Exception as e:
             print(f"⚠️ Created new file: {str(e)}")
-            return pd.DataFrame(columns=["Amount", "Category", "Date"])
+            return pd.DataFrame(columns=self.columns)
+
+    def _migrate_parquet_file(self):
+        import pyarrow.parquet as pq
+        df = pq.read_table(self.file).to_pandas()
+        df['Date'] = pd.to_datetime(df['Date'])
+        legacy_file = self.file + ".legacy"
+        os.replace(self.file, legacy_file)
+        self._write_parquet(df)
+        os.remove(legacy_file)
+        print(f"📦 Migrated {self.file} to a Parquet dataset")
+        return df
+
+    def _write_parquet(self, df):
+        import pyarrow as pa
+        schema = pa.schema([
+            ("Amount", pa.float32()),
+            ("Category", pa.dictionary(pa.int8(), pa.string())),
+            ("Date", pa.timestamp("ns"))
+        ])
+        df = df[schema.names].astype({"Amount": "float32", "Category": "category"})
+        self._write_parquet_part(
+            pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+
+    def _parquet_files(self):
+        files = []
+        for name in os.listdir(self.file):
+            kind, _, rest = name.partition("-")
+            if kind in ("part", "merged") and rest.endswith(".parquet"):
+                files.append((int(rest[:-len(".parquet")]), kind == "part", name))
+        return sorted(files)
+
+    def _live_parquet_files(self):
+        files = self._parquet_files()
+        merged = [seq for seq, is_part, _ in files if not is_part]
+        if not merged:
+            return [name for _, _, name in files]
+        cutoff = max(merged)
+        live = []
+        for seq, is_part, name in files:
+            if seq > cutoff or (seq == cutoff and not is_part):
+                live.append(name)
+            else:
+                os.remove(os.path.join(self.file, name))
+        return live
+
+    def _read_parquet_tables(self, names):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        return pa.concat_tables([
+            pq.read_table(os.path.join(self.file, name), memory_map=True)
+            for name in names
+        ])
+
+    def _read_parquet_dataset(self):
+        names = self._live_parquet_files()
+        if not names:
+            return pd.DataFrame(columns=self.columns)
+        df = self._read_parquet_tables(names).to_pandas()
+        self.columns = list(df.columns)
+        return df
+
+    def _write_parquet_part(self, table, name=None):
+        import pyarrow.parquet as pq
+        os.makedirs(self.file, exist_ok=True)
+        if name is None:
+            files = self._parquet_files()
+            name = f"part-{files[-1][0] + 1 if files else 1:012d}.parquet"
+        tmp_file = os.path.join(self.file, "_" + name)
+        pq.write_table(table, tmp_file)
+        os.replace(tmp_file, os.path.join(self.file, name))
+        return name
+
+    def _compact_parquet(self):
+        names = self._live_parquet_files()
+        if len(names) <= self.compact_every:
+            return
+        table = self._read_parquet_tables(names).unify_dictionaries().combine_chunks()
+        newest = self._parquet_files()[-1][0]
+        merged = self._write_parquet_part(table, f"merged-{newest:012d}.parquet")
+        for name in names:
+            if name != merged:
+                os.remove(os.path.join(self.file, name))
+
+    def _last_byte(self):
+        with open(self.file, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1)
+
+    def _persist(self, entries):
+        if self._is_parquet():
+            frame = pd.DataFrame(entries)
+            frame['Category'] = pd.Categorical.from_codes(
+                frame['Category'], dtype=self.category_dtype)
+            frame['Date'] = pd.to_datetime(frame['Date'])
+            self._write_parquet(frame)
+            try:
+                self._compact_parquet()
+            except Exception as e:
+                print(f"⚠️ Parquet compaction skipped: {str(e)}")
+            return
+        new_file = not os.path.exists(self.file) or os.path.getsize(self.file) == 0
+        missing_newline = not new_file and self._last_byte() != b"\n"
+        with open(self.file, 'a', newline='') as f:
+            if missing_newline:
+                f.write("\n")
+            writer = csv.writer(f, lineterminator="\n")
+            if new_file:
+                writer.writerow(self.columns)
+            writer.writerows([
+                pd.Timestamp(entry[col]).isoformat(sep=' ') if col == "Date"
+                else self.categories[entry[col]] if col == "Category"
+                else entry.get(col)
+                for col in self.columns
+            ] for entry in entries)
+
+    def _top_category_id(self):
+        version, cached = self._top_category_cache
+        if version == self._df_version:
+            return cached
+        top_id = int(_argmax_hist(self._cat[:self._n], len(self.categories)))
+        self._top_category_cache = (self._df_version, top_id)
+        return top_id
+
+    def _top_category(self):
+        return self.categories[self._top_category_id()]
 
-    def _optimize_dataframe(self):
-        if not self.df.empty:
-            self.df['Category'] = self.df['Category'].astype('category')
-            self.df['Amount'] = pd.to_numeric(self.df['Amount'], downcast='float')
+    def _monthly_totals(self):
+        months, inverse = np.unique(self._month[:self._n], return_inverse=True)
+        totals = np.bincount(inverse, weights=self._amt[:self._n])
+        labels = np.datetime_as_string(months.astype('datetime64[M]'), unit='M')
+        return dict(zip(labels.tolist(), totals.tolist()))
 
     def log_expense(self, amount, description, date=None):
         try:
-            category = self.classifier.classify(description)
+            category_id = self.classifier.classify(description)
             new_entry = {
                 "Amount": float(amount),
-                "Category": category,
-                "Date": pd.to_datetime(date) if date else datetime.now()
+                "Category": category_id,
+                "Date": pd.Timestamp(date).value if date else _local_now_ns()
             }
-            self.df = pd.concat([self.df, pd.DataFrame([new_entry])], ignore_index=True)
-            self._optimize_dataframe()
-            self.df.to_csv(self.file, index=False)
+            month = np.datetime64(
+                new_entry["Date"], 'ns').astype('datetime64[M]').astype(np.int32)
+            self._persist([new_entry])
+            self._reserve(self._n + 1)
+            self._amt[self._n] = new_entry["Amount"]
+            self._cat[self._n] = category_id
+            self._dt[self._n] = new_entry["Date"]
+            self._month[self._n] = month
+            self._n += 1
+            self._df_version += 1
             return True
         except Exception as e:
             print(f"❌ Error logging expense: {str(e)}")
             return False
+
+    def log_expenses_batch(self, records):
+        try:
+            batch = pd.DataFrame(records)
+            if batch.empty:
+                return 0
+            raw_dates = batch['Date'] if 'Date' in batch else pd.Series(None, index=batch.index)
+            dates = pd.to_datetime(raw_dates, format='mixed', errors='coerce')
+            bad = dates.isna() & raw_dates.notna()
+            if bad.any():
+                row = bad.to_numpy().argmax()
+                raise ValueError(f"Unrecognised date in row {row + 1}: {raw_dates.iloc[row]!r}")
+            batch = pd.DataFrame({
+                "Amount": pd.to_numeric(batch['Amount']).astype('float32'),
+                "Category": self.classifier.classify_many(batch['Description']),
+                "Date": dates.fillna(pd.Timestamp(_local_now_ns()))
+            })
+            self._persist(batch.to_dict('records'))
+            self._extend(batch)
+            return len(batch)
+        except Exception as e:
+            print(f"❌ Error importing expenses: {str(e)}")
+            return 0
         
     def voice_log_expense(self):
         try:
@@ -108,32 +472,43 @@ class BudgetAI:
             if not spoken:
                 raise ValueError("Couldn't understand audio")
                 
-            amount = re.search(r"(\d+)\s*(rs|rupees|₹)?", spoken)
-            desc = re.sub(r"\d+\s*(rs|rupees|₹)?\s*", "", spoken).strip()
-            
+            amount = _VOICE_RE.search(spoken)
             if not amount:
                 raise ValueError("No amount detected")
                 
+            desc = (spoken[:amount.start()] + spoken[amount.end():]).strip()
             success = self.log_expense(amount.group(1), desc)
             if success:
                 self.voice.speak(f"Logged ₹{amount.group(1)} for {desc}")
             return success
             
         except Exception as e:
-            self.voice.speak(f"Error: {str(e)}")
+            self.announce(f"Error: {str(e)}")
             return False
 
+    def announce(self, text, wait=False):
+        if self._voice is None:
+            print(f"🔊 AI: {text}")
+            return
+        self._voice.speak(text)
+        if wait:
+            self._voice.wait()
+
     def get_analysis(self):
         if self.df.empty:
             return {"error": "No expenses logged yet"}
             
+        version, cached = self._analysis_cache
+        if version == self._df_version:
+            return cached
+            
         try:
             analysis = {
                 "total": round(self.df['Amount'].sum(), 2),
-                "top_category": self.df['Category'].mode()[0],
-                "monthly": self.df.groupby(
-                    self.df['Date'].dt.to_period('M'))['Amount'].sum().to_dict()
+                "top_category": self._top_category(),
+                "monthly": self._monthly_totals()
             }
+            self._analysis_cache = (self._df_version, analysis)
             return analysis
         except Exception as e:
             return {"error": f"Analysis error: {str(e)}"}
@@ -143,10 +518,10 @@ class BudgetAI:
             return "💡 Start by logging your first expense!"
             
         try:
-            top_cat = self.df['Category'].mode()[0]
-            return random.choice(self.tips_db.get(top_cat, [
-                "💰 Save 10% of every paycheck automatically!"
-            ]))
+            top_id = self._top_category_id()
+            if top_id < len(self._tip_cyclers):
+                return next(self._tip_cyclers[top_id])
+            return next(self._default_cycler)
         except:
             return "💡 Track your expenses to get personalized tips!"
 
@@ -155,16 +530,16 @@ class BudgetAI:
             return "Need at least 7 entries for accurate predictions"
             
         try:
-            self.df['Date'] = pd.to_datetime(self.df['Date'])
-            self.df['Days'] = (self.df['Date'] - self.df['Date'].min()).dt.days
+            dates = self._dt[:self._n]
+            days = ((dates - dates.min()) // _NS_PER_DAY).astype(np.float64)
+            amounts = self._amt[:self._n].astype(np.float64)
             
-            model = LinearRegression()
-            model.fit(self.df[['Days']], self.df['Amount'])
+            slope, intercept = _ols1d(days, amounts)
             
-            next_day = self.df['Days'].max() + 1
-            prediction = model.predict([[next_day]])[0]
+            next_day = days.max() + 1
+            prediction = slope * next_day + intercept
             
-            trend = "↑ Increasing" if model.coef_[0] > 0 else "↓ Decreasing"
+            trend = "↑ Increasing" if slope > 0 else "↓ Decreasing"
             return f"Predicted: ₹{prediction:.2f} ({trend} trend)"
         
         except Exception as e:
@@ -176,32 +551,37 @@ class BudgetAI:
             return
             
         try:
+            import matplotlib.pyplot as plt
+            
             plt.figure(figsize=(15, 5))
             
             plt.subplot(1, 3, 1)
-            monthly = self.df.groupby(self.df['Date'].dt.to_period('M'))['Amount'].sum()
+            monthly = pd.Series(self._monthly_totals())
             monthly.plot(kind='bar', color='#4CAF50')
             plt.title("Monthly Spending Trend")
+            plt.xlabel("Month")
             plt.ylabel("Amount (₹)")
             
             plt.subplot(1, 3, 2)
-            self.df['Category'].value_counts().plot.pie(
+            counts = self.df['Category'].value_counts()
+            counts[counts > 0].plot.pie(
                 autopct='%1.1f%%', 
                 colors=['#FF5722', '#2196F3', '#9C27B0', '#607D8B']
             )
             plt.title("Spending by Category")
             
             plt.subplot(1, 3, 3)
-            self.df['Weekday'] = self.df['Date'].dt.day_name()
-            self.df['Hour'] = self.df['Date'].dt.hour
-            pd.pivot_table(
-                self.df, 
-                values='Amount', 
-                index='Weekday', 
-                columns='Hour',
-                aggfunc='sum',
-                fill_value=0
-            ).plot(kind='box', vert=False)
+            dates = self.df['Date'].dt
+            heatmap = np.zeros((7, 24), np.float32)
+            np.add.at(
+                heatmap,
+                (dates.dayofweek.to_numpy(np.int8), dates.hour.to_numpy(np.int8)),
+                self.df['Amount'].to_numpy(np.float32)
+            )
+            plt.imshow(heatmap, aspect='auto', cmap='YlOrRd')
+            plt.yticks(range(7), ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"])
+            plt.xlabel("Hour")
+            plt.colorbar(label="Amount (₹)")
             plt.title("Spending Patterns")
             
             plt.tight_layout()
@@ -222,9 +602,10 @@ def run_app():
         print("4. Get AI Tip")
         print("5. Predict Spending")
         print("6. Show Insights")
-        print("7. Exit")
+        print("7. Import Expenses (CSV)")
+        print("8. Exit")
         
-        choice = input("\nChoose (1-7): ").strip()
+        choice = input("\nChoose (1-8): ").strip()
         
         if choice == "1":
             try:
@@ -261,7 +642,16 @@ def run_app():
             ai.show_insights()
             
         elif choice == "7":
-            ai.voice.speak("Goodbye! Keep saving smart!")
+            path = input("CSV file (Amount, Description[, Date]): ").strip()
+            try:
+                count = ai.log_expenses_batch(pd.read_csv(path))
+                if count:
+                    print(f"✅ Imported {count} expenses!")
+            except Exception as e:
+                print(f"❌ Couldn't read file: {str(e)}")
+            
+        elif choice == "8":
+            ai.announce("Goodbye! Keep saving smart!", wait=True)
             break
             
         else:
@@ -0,0 +1,147 @@
+import os
+
+import pandas as pd
+import pytest
+
+from budget_ai import BudgetAI, ExpenseClassifier
+
+
+def test_reload_keeps_categories(tmp_path):
+    data_file = tmp_path / "expenses.csv"
+    data_file.write_text(
+        "Amount,Category,Date\n"
+        "120.0,Food,2025-02-01 20:00:00\n"
+        "80.0,Transport,2025-02-02 09:00:00\n"
+        "999.0,Others,2025-02-03 10:00:00\n"
+        "5.0,Transport,2025-02-05 11:00:00\n"
+        "1.0,Rent,2025-02-06 12:00:00\n"
+    )
+
+    ai = BudgetAI(str(data_file))
+
+    assert ai.df['Category'].tolist() == [
+        "Food", "Transport", "Others", "Transport", "Rent"
+    ]
+    assert ai.get_analysis()['top_category'] == "Transport"
+
+
+def test_single_file_parquet_is_migrated_and_writable(tmp_path):
+    pytest.importorskip("pyarrow")
+    data_file = tmp_path / "expenses.parquet"
+    pd.DataFrame({
+        "Amount": [250.0, 40.0],
+        "Category": ["Rent", "Food"],
+        "Date": pd.to_datetime(["2025-03-01 10:00", "2025-03-02 13:30"])
+    }).to_parquet(data_file)
+
+    ai = BudgetAI(str(data_file))
+
+    assert ai.log_expense(5, "bus", "2025-03-03 08:00")
+    assert data_file.is_dir()
+    reloaded = BudgetAI(str(data_file))
+    assert reloaded.df['Category'].tolist() == ["Rent", "Food", "Transport"]
+    assert reloaded.df['Amount'].tolist() == [250.0, 40.0, 5.0]
+
+
+def test_failed_log_leaves_data_unchanged(tmp_path, monkeypatch):
+    ai = BudgetAI(str(tmp_path / "expenses.csv"))
+    assert ai.log_expense(10, "pizza", "2025-03-01")
+
+    def fail(entries):
+        raise OSError("disk full")
+    monkeypatch.setattr(ai, "_persist", fail)
+
+    assert not ai.log_expense(5, "bus", "2025-03-02")
+    assert len(ai.df) == 1
+    assert ai.get_analysis()['total'] == 10
+
+
+def test_interrupted_parquet_compaction_does_not_duplicate_rows(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import budget_ai
+
+    data_file = tmp_path / "expenses.parquet"
+    ai = BudgetAI(str(data_file))
+    ai.compact_every = 3
+    for day in range(1, 4):
+        assert ai.log_expense(day, "pizza", f"2025-03-{day:02d}")
+
+    def crash(path):
+        raise OSError("crashed mid-compaction")
+    monkeypatch.setattr(budget_ai.os, "remove", crash)
+    assert ai.log_expense(4, "bus", "2025-03-04")
+    monkeypatch.undo()
+
+    assert any(name.startswith("merged-") for name in os.listdir(data_file))
+    reloaded = BudgetAI(str(data_file))
+    assert reloaded.df['Amount'].tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert reloaded.log_expense(5, "rent", "2025-03-05")
+    assert BudgetAI(str(data_file)).df['Amount'].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+@pytest.mark.parametrize("file_name", ["expenses.csv", "expenses.parquet"])
+def test_batch_import_round_trip(tmp_path, file_name):
+    if file_name.endswith(".parquet"):
+        pytest.importorskip("pyarrow")
+    data_file = str(tmp_path / file_name)
+    ai = BudgetAI(data_file)
+
+    count = ai.log_expenses_batch([
+        {"Amount": 120, "Description": "Swiggy dinner", "Date": "2025-02-01 20:00"},
+        {"Amount": 80, "Description": "metro card", "Date": None},
+        {"Amount": 999, "Description": "gift", "Date": "15/01/2025"},
+    ])
+
+    assert count == 3
+    assert ai.df['Category'].tolist() == ["Food", "Transport", "Others"]
+    assert ai.df['Date'][0] == pd.Timestamp("2025-02-01 20:00")
+    assert ai.df['Date'][2] == pd.Timestamp("2025-01-15")
+    assert ai.df['Date'][1] > pd.Timestamp("2025-02-01")
+    reloaded = BudgetAI(data_file)
+    pd.testing.assert_frame_equal(reloaded.df, ai.df)
+
+
+def test_batch_import_without_dates(tmp_path):
+    ai = BudgetAI(str(tmp_path / "expenses.csv"))
+
+    assert ai.log_expenses_batch(
+        pd.DataFrame({"Amount": [10, 20], "Description": ["pg rent", "coffee"]})) == 2
+    assert ai.df['Category'].tolist() == ["Rent", "Food"]
+    assert ai.df['Date'].notna().all()
+
+
+def test_batch_import_failure_leaves_data_unchanged(tmp_path, monkeypatch):
+    ai = BudgetAI(str(tmp_path / "expenses.csv"))
+    assert ai.log_expense(10, "pizza", "2025-03-01")
+    before = ai.get_analysis()
+
+    def fail(entries):
+        raise OSError("disk full")
+    monkeypatch.setattr(ai, "_persist", fail)
+
+    assert ai.log_expenses_batch([{"Amount": 5, "Description": "bus"}]) == 0
+    assert len(ai.df) == 1
+    assert ai.get_analysis() == before
+
+
+def test_batch_import_reports_bad_date(tmp_path, capsys):
+    ai = BudgetAI(str(tmp_path / "expenses.csv"))
+
+    assert ai.log_expenses_batch([
+        {"Amount": 5, "Description": "bus", "Date": "2025-03-01"},
+        {"Amount": 6, "Description": "bus", "Date": "someday"},
+    ]) == 0
+    assert "row 2" in capsys.readouterr().out
+    assert ai.df.empty
+
+
+def test_classify_many_matches_classify():
+    classifier = ExpenseClassifier()
+    descriptions = [
+        "Zomato lunch", "UBER to office", "hostel fee", "birthday gift",
+        "metro to pg", "", "coffee then taxi",
+    ]
+
+    batch = classifier.classify_many(pd.Series(descriptions))
+
+    assert batch.tolist() == [classifier.classify(text) for text in descriptions]